@@ -1,16 +1,276 @@
 import numpy as np
 import pandas as pd
 import yfinance as yf
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+import matplotlib
+matplotlib.use('Agg')  # non-interactive backend; figures are only saved to disk
+from matplotlib.figure import Figure
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import argparse
+import getpass
+import hashlib
+import json
+import multiprocessing
 import os
+import threading
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+try:
+    from dask.distributed import Client
+    HAVE_DASK = True
+except ImportError:
+    HAVE_DASK = False
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit when numba is not installed; returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+CONFIG_DIR = os.path.join(os.path.expanduser('~'), '.stock_analyzer')
+LAST_CONFIG_PATH = os.path.join(CONFIG_DIR, 'last.json')
+DOWNLOAD_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+RSI_WARMUP_PERIODS = 10  # Wilder's average keeps (1 - 1/rsi_period) ** rows of its seed, about e**-10
+DOWNLOAD_MIN_WARMUP_ROWS = 253  # downloads cover at least a year of warm-up so window changes reuse them
+METRICS_CACHE_MAX_AGE = 7 * 24 * 60 * 60  # seconds, for sweeping the retired metrics cache
+FIGURE_DPI = 120
+HIRES_FIGURE_DPI = 300
+LTTB_THRESHOLD = 4000  # series longer than this are downsampled before plotting
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD date string, raising ValueError on any other format."""
+    return pd.to_datetime(value, format='%Y-%m-%d')
+
+
+def _cli_date(value):
+    try:
+        parse_date(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', use YYYY-MM-DD")
+    return value
+
+
+def _cli_positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number '{value}'")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a positive number")
+    return number
+
+
+def parse_cli(argv=None):
+    """Parse command line options; with no options the analysis falls back to interactive prompts."""
+    parser = argparse.ArgumentParser(description='Analyze historical performance, volatility and RSI of stocks.')
+    parser.add_argument('--author', help='name shown on the plots and in the metadata')
+    parser.add_argument('--tickers', help='stock tickers separated by comma (e.g., GOOGL,AAPL,MSFT)')
+    parser.add_argument('--start', type=_cli_date, help='start date (YYYY-MM-DD)')
+    parser.add_argument('--end', type=_cli_date, help='end date (YYYY-MM-DD)')
+    parser.add_argument('--vol-window', type=_cli_positive_int,
+                        help='number of days for volatility calculation (default: 30)')
+    parser.add_argument('--rsi-period', type=_cli_positive_int,
+                        help='number of days for RSI calculation (default: 14)')
+    parser.add_argument('--config', help='JSON file with tickers, start_date, end_date, vol_window and rsi_period')
+    parser.add_argument('--reuse-last', action='store_true',
+                        help=f'reuse the configuration of the last run ({LAST_CONFIG_PATH})')
+    parser.add_argument('--hires', action='store_true',
+                        help=f'save plots at {HIRES_FIGURE_DPI} dpi instead of {FIGURE_DPI} dpi')
+    parser.add_argument('--fp32', action='store_true',
+                        help='compute the metrics from float32 close prices; saved Close values are float32 too')
+    parser.add_argument('--engine', choices=['threads', 'dask'], default='threads',
+                        help='run the per-ticker analysis in threads, or across processes with dask '
+                             '(a multiprocessing pool when dask is not installed)')
+    args = parser.parse_args(argv)
+    
+    # Resolve every non-interactive configuration here so scripted runs never reach a prompt
+    analysis_options = [option for option, value in [('--tickers', args.tickers), ('--start', args.start),
+                                                     ('--end', args.end), ('--vol-window', args.vol_window),
+                                                     ('--rsi-period', args.rsi_period)]
+                        if value is not None]
+    config_path = LAST_CONFIG_PATH if args.reuse_last else args.config
+    if config_path and analysis_options:
+        parser.error(f"{'--reuse-last' if args.reuse_last else '--config'} cannot be combined with "
+                     f"{', '.join(analysis_options)}")
+    if analysis_options and not args.tickers:
+        parser.error(f"{', '.join(analysis_options)} can only be used together with --tickers")
+    
+    if config_path:
+        try:
+            config = load_config(config_path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            parser.error(f'could not load configuration from {config_path}: {str(e)}')
+        args.tickers, args.start, args.end = config['tickers'], config['start_date'], config['end_date']
+        args.vol_window, args.rsi_period = config['vol_window'], config['rsi_period']
+        args.author = args.author or config['author']
+    elif args.tickers:
+        if not (args.start and args.end):
+            parser.error('--tickers requires --start and --end')
+        args.tickers = [tick.strip().upper() for tick in args.tickers.split(',') if tick.strip()]
+        if not args.tickers:
+            parser.error('--tickers requires at least one ticker')
+        if parse_date(args.end) <= parse_date(args.start):
+            parser.error('--end must be after --start')
+        args.vol_window = args.vol_window or 30
+        args.rsi_period = args.rsi_period or 14
+    
+    if args.tickers and not args.author:
+        args.author = default_author()
+    return args
+
+
+def default_author():
+    """Author name for non-interactive runs without --author: the login name of the current user."""
+    try:
+        return getpass.getuser()
+    except (OSError, KeyError):
+        return 'Anonymous'
+
+
+def load_config(path):
+    """Load and validate an analysis configuration from a JSON file."""
+    with open(path) as f:
+        config = json.load(f)
+    tickers = config['tickers']
+    if isinstance(tickers, str):
+        tickers = tickers.split(',')
+    tickers = [tick.strip().upper() for tick in tickers if tick.strip()]
+    if not tickers:
+        raise ValueError("at least one ticker is required")
+    start_date, end_date = config['start_date'], config['end_date']
+    if parse_date(end_date) <= parse_date(start_date):
+        raise ValueError("end_date must be after start_date")
+    vol_window, rsi_period = int(config['vol_window']), int(config['rsi_period'])
+    if vol_window <= 0 or rsi_period <= 0:
+        raise ValueError("vol_window and rsi_period must be positive")
+    return {'tickers': tickers, 'start_date': start_date, 'end_date': end_date,
+            'vol_window': vol_window, 'rsi_period': rsi_period, 'author': config.get('author')}
+
+
+# fastmath without 'nnan'/'ninf' so the NaN checks below are not optimized away
+@njit(fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})
+def _compute_metrics(close, vol_window, rsi_period):
+    """Compute log returns, annualized rolling volatility and Wilder's RSI in a single pass over close."""
+    n = close.size
+    log_ret = np.empty_like(close)
+    vol = np.empty_like(close)
+    rsi = np.empty_like(close)
+    alpha = 1.0 / rsi_period
+    
+    vol_sum = 0.0
+    vol_sum_sq = 0.0
+    vol_count = 0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    rsi_count = 0
+    
+    for i in range(n):
+        if i == 0:
+            ret = np.nan
+        else:
+            ret = np.log(close[i] / close[i - 1])
+        log_ret[i] = ret
+        
+        # Rolling sample standard deviation: add the new return, drop the one leaving the window
+        if not np.isnan(ret):
+            vol_sum += ret
+            vol_sum_sq += ret * ret
+            vol_count += 1
+        if i >= vol_window:
+            old = log_ret[i - vol_window]
+            if not np.isnan(old):
+                vol_sum -= old
+                vol_sum_sq -= old * old
+                vol_count -= 1
+        if vol_count == vol_window and vol_window > 1:
+            var = (vol_sum_sq - vol_sum * vol_sum / vol_window) / (vol_window - 1)
+            vol[i] = np.sqrt(max(var, 0.0) * 252.0)
+        else:
+            vol[i] = np.nan
+        
+        # Wilder's smoothing of gains and losses, seeded with the first price change
+        if i > 0:
+            delta = close[i] - close[i - 1]
+            if not np.isnan(delta):
+                gain = max(delta, 0.0)
+                loss = max(-delta, 0.0)
+                if rsi_count == 0:
+                    avg_gain = gain
+                    avg_loss = loss
+                else:
+                    avg_gain += alpha * (gain - avg_gain)
+                    avg_loss += alpha * (loss - avg_loss)
+                rsi_count += 1
+        if rsi_count < rsi_period:
+            rsi[i] = np.nan
+        elif avg_loss == 0.0:
+            rsi[i] = 100.0 if avg_gain > 0.0 else np.nan
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    return log_ret, vol, rsi
+
+
+@njit
+def _lttb(x, y, n_out):
+    """Return the indices of n_out points of (x, y) picked by Largest-Triangle-Three-Buckets."""
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    sampled = np.empty(n_out, dtype=np.int64)
+    sampled[0] = 0
+    sampled[n_out - 1] = n - 1
+    bucket_size = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = n if i == n_out - 3 else int((i + 2) * bucket_size) + 1
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Keep the point forming the largest triangle with the last kept point and the next bucket's average
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                       - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + np.argmax(areas)
+        sampled[i + 1] = a
+    return sampled
+
 
 class StockAnalyzer:
-    def __init__(self, author_name):
+    def __init__(self, author_name, hires=False, fp32=False, engine='threads'):
         self.author_name = author_name
+        self.dpi = HIRES_FIGURE_DPI if hires else FIGURE_DPI
+        self.fp32 = fp32
+        self.engine = engine
+        self._local = threading.local()
         self.output_dir = 'stock_analysis_results'
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def __getstate__(self):
+        # The per-thread figure cache cannot be pickled; worker processes start with their own
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
 
     def get_user_input(self):
         """Get stock tickers and date range from user."""
@@ -26,7 +286,7 @@ class StockAnalyzer:
         while True:
             try:
                 start_date = input("Enter start date (YYYY-MM-DD): ").strip()
-                datetime.strptime(start_date, '%Y-%m-%d')
+                parse_date(start_date)
                 break
             except ValueError:
                 print("Invalid date format. Please use YYYY-MM-DD")
@@ -34,8 +294,9 @@ class StockAnalyzer:
         while True:
             try:
                 end_date = input("Enter end date (YYYY-MM-DD): ").strip()
-                datetime.strptime(end_date, '%Y-%m-%d')
-                break
+                if parse_date(end_date) > parse_date(start_date):
+                    break
+                print("End date must be after the start date.")
             except ValueError:
                 print("Invalid date format. Please use YYYY-MM-DD")
         
@@ -59,33 +320,177 @@ class StockAnalyzer:
         
         return tickers, start_date, end_date, vol_window, rsi_period
 
+    def save_config(self, config, path=LAST_CONFIG_PATH):
+        """Persist an analysis configuration so it can be reused with --reuse-last."""
+        tickers, start_date, end_date, vol_window, rsi_period = config
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump({'tickers': tickers, 'start_date': start_date, 'end_date': end_date,
+                           'vol_window': vol_window, 'rsi_period': rsi_period,
+                           'author': self.author_name}, f, indent=2)
+        except OSError as e:
+            print(f"Could not save configuration to {path}: {str(e)}")
+
+    def get_config(self, args=None):
+        """Get the analysis configuration from the options resolved by parse_cli, or from the user."""
+        if args is not None and args.tickers:
+            config = args.tickers, args.start, args.end, args.vol_window, args.rsi_period
+        else:
+            config = self.get_user_input()
+        self.save_config(config)
+        return config
+
     def calculate_rsi(self, data, periods=14):
-        """Calculate RSI for the given data."""
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0))
-        loss = (-delta.where(delta < 0, 0))
-        avg_gain = gain.rolling(window=periods).mean()
-        avg_loss = loss.rolling(window=periods).mean()
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-
-    def download_stock_data(self, ticker, start_date, end_date, lookback_days):
-        """Download stock data for a given ticker with additional lookback period."""
+        """Calculate Wilder's RSI for the given data."""
+        close = data['Close'].to_numpy()
+        delta = np.empty_like(close)
+        delta[0] = np.nan
+        delta[1:] = close[1:] - close[:-1]
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+        # There is no price change on the first row, keep it out of the averages
+        gain[0] = loss[0] = np.nan
+        avg_gain = pd.Series(gain).ewm(alpha=1 / periods, adjust=False, min_periods=periods).mean().to_numpy()
+        avg_loss = pd.Series(loss).ewm(alpha=1 / periods, adjust=False, min_periods=periods).mean().to_numpy()
+        
+        # Without losses RS is infinite (RSI 100); without any price change RSI is undefined
+        rs = np.empty_like(avg_gain)
+        no_loss = avg_loss == 0
+        np.divide(avg_gain, avg_loss, out=rs, where=~no_loss)
+        rs[no_loss] = np.inf
+        rs[no_loss & (avg_gain == 0)] = np.nan
+        
+        rsi = rs
+        rsi += 1.0
+        np.reciprocal(rsi, out=rsi)
+        rsi *= -100.0
+        rsi += 100.0
+        return pd.Series(rsi, index=data.index)
+
+    def _cache_path(self, cache_dir, *key):
+        """Return the parquet cache path for the given key under the output directory."""
+        digest = hashlib.sha1('|'.join(str(part) for part in key).encode()).hexdigest()
+        return os.path.join(self.output_dir, cache_dir, f'{digest}.parquet')
+
+    def _read_cache(self, path, max_age):
+        """Load a cached frame, or return None if it is missing, older than max_age seconds or unreadable.
+        
+        Entries older than max_age are deleted.
+        """
+        try:
+            if time.time() - os.path.getmtime(path) < max_age:
+                return pd.read_parquet(path)
+            os.remove(path)
+        except (OSError, ImportError, ValueError):
+            pass
+        return None
+
+    def _sweep_cache(self, cache_dir, max_age):
+        """Delete cache entries older than max_age seconds, including ones whose key is never read again."""
+        cache_dir = os.path.join(self.output_dir, cache_dir)
+        now = time.time()
+        try:
+            with os.scandir(cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.parquet') and now - entry.stat().st_mtime >= max_age:
+                        os.remove(entry.path)
+        except OSError:
+            pass
+
+    def _write_cache(self, path, data):
+        """Store a frame in the parquet cache, keeping the run going if that is not possible."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data.to_parquet(path, compression='snappy')
+        except (OSError, ImportError, ValueError) as e:
+            print(f"Could not cache data to {path}: {str(e)}")
+
+    def warmup_rows(self, vol_window, rsi_period):
+        """Number of rows needed before the start date for accurate first volatility and RSI values.
+        
+        The rolling volatility only needs its window, but Wilder's RSI average is recursive and
+        needs several periods of history to forget how it was seeded.
+        """
+        return max(vol_window, RSI_WARMUP_PERIODS * rsi_period) + 1
+
+    def lookback_days(self, warmup_rows):
+        """Calendar days to download ahead of the start date to cover the given warm-up trading days."""
+        # 7 calendar days per 5 trading days, 5% more for market holidays (about 10 per 252
+        # trading days) and a few days of slack
+        return -(-warmup_rows * 147 // 100) + 5
+
+    def download_stock_data(self, tickers, start_date, end_date, warmup_rows):
+        """Download stock data for all tickers in one batched request with warm-up rows before start_date.
+        
+        Downloads are cached on disk per ticker and date range for up to a day. They cover at least
+        DOWNLOAD_MIN_WARMUP_ROWS of warm-up, so re-running with other windows reuses them.
+        """
+        download_rows = max(warmup_rows, DOWNLOAD_MIN_WARMUP_ROWS)
+        lookback = pd.Timedelta(days=self.lookback_days(download_rows))
+        lookback_start = (parse_date(start_date) - lookback).strftime('%Y-%m-%d')
+        self._sweep_cache('_cache', DOWNLOAD_CACHE_MAX_AGE)
+        stock_data = {}
+        cache_paths = {}
+        for ticker in tickers:
+            cache_paths[ticker] = self._cache_path('_cache', ticker, start_date, end_date)
+            data = self._read_cache(cache_paths[ticker], DOWNLOAD_CACHE_MAX_AGE)
+            # A shorter history is only reused when it came from a download that asked for enough
+            # warm-up, i.e. the ticker has no older prices
+            if data is not None and (warmup_rows <= DOWNLOAD_MIN_WARMUP_ROWS or
+                                     data.index.get_slice_bound(start_date, 'left') >= warmup_rows):
+                stock_data[ticker] = data
+        
+        missing = [ticker for ticker in tickers if ticker not in stock_data]
+        if not missing:
+            return stock_data
+        
         try:
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            lookback_start = (start_dt - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
-            data = yf.download(ticker, start=lookback_start, end=end_date)
-            return data
+            batch = yf.download(missing, start=lookback_start, end=end_date, group_by='ticker',
+                                threads=True, progress=False, auto_adjust=False)
         except Exception as e:
-            print(f"Error downloading {ticker}: {str(e)}")
-            return None
+            print(f"Error downloading {', '.join(missing)}: {str(e)}")
+            return stock_data
+        
+        if not isinstance(batch.columns, pd.MultiIndex):
+            batch = pd.concat({missing[0]: batch}, axis=1)
+        
+        for ticker in missing:
+            if ticker in batch.columns.get_level_values(0):
+                data = batch[ticker].dropna(how='all')
+                if not data.empty:
+                    self._write_cache(cache_paths[ticker], data)
+                    stock_data[ticker] = data
+                    continue
+            print(f"No data returned for {ticker}")
+        return stock_data
 
     def calculate_metrics(self, data, vol_window, rsi_period, start_date):
         """Calculate log returns, volatility and RSI for the stock data."""
-        data['Log_Ret'] = np.log(data['Close'] / data['Close'].shift(1))
-        data['Volatility'] = data['Log_Ret'].rolling(window=vol_window).std() * np.sqrt(252)
-        data['RSI'] = self.calculate_rsi(data, rsi_period)
+        if start_date:
+            # Keep only the warm-up rows the rolling windows need ahead of start_date
+            first = data.index.get_slice_bound(start_date, 'left') - self.warmup_rows(vol_window, rsi_period)
+            if first > 0:
+                data = data.iloc[first:].copy()
+        
+        if self.fp32:
+            data['Close'] = data['Close'].astype(np.float32)
+        
+        close = data['Close'].to_numpy(dtype=np.float32 if self.fp32 else np.float64)
+        if HAVE_NUMBA:
+            log_ret, vol, rsi = _compute_metrics(close, vol_window, rsi_period)
+            data['Log_Ret'] = log_ret
+            data['Volatility'] = vol
+            data['RSI'] = rsi
+        else:
+            log_ret = np.empty_like(close)
+            log_ret[0] = np.nan
+            np.log(close[1:] / close[:-1], out=log_ret[1:])
+            data['Log_Ret'] = log_ret
+            # pandas rolling and ewm return float64; keep the dtype of the numba path
+            volatility = data['Log_Ret'].rolling(window=vol_window).std() * np.sqrt(252)
+            data['Volatility'] = volatility.astype(close.dtype, copy=False)
+            data['RSI'] = self.calculate_rsi(data, rsi_period).astype(close.dtype, copy=False)
         
         data.attrs['author'] = self.author_name
         
@@ -93,9 +498,27 @@ class StockAnalyzer:
             data = data[start_date:]
         return data
 
+    def _plot_series(self, ax, series, color):
+        """Plot a series, downsampling long ones with LTTB to about two points per output pixel."""
+        x, y = series.index, series.to_numpy(dtype=np.float64)
+        if len(series) > LTTB_THRESHOLD:
+            valid = np.flatnonzero(np.isfinite(y))
+            n_out = int(2 * ax.figure.get_figwidth() * self.dpi)
+            keep = valid[_lttb(valid.astype(np.float64), y[valid], n_out)]
+            x, y = x[keep], y[keep]
+        ax.plot(x, y, color=color)
+
     def plot_stock_analysis(self, stock_data, ticker, vol_window, rsi_period):
-        """Create plots for a single stock."""
-        fig = plt.figure(figsize=(12, 13))
+        """Create plots for a single stock.
+        
+        Each thread keeps one figure that is cleared and redrawn for every stock, so the
+        returned figure is only valid until the next call from the same thread.
+        """
+        fig = getattr(self._local, 'fig', None)
+        if fig is None:
+            fig = self._local.fig = Figure(figsize=(12, 13))
+        else:
+            fig.clf()
         
         gs = fig.add_gridspec(4, 1, height_ratios=[0.2, 1, 1, 1], hspace=0.4)
         
@@ -108,17 +531,17 @@ class StockAnalyzer:
         ax2 = fig.add_subplot(gs[2])
         ax3 = fig.add_subplot(gs[3])
         
-        stock_data['Close'].plot(ax=ax1, color='blue')
+        self._plot_series(ax1, stock_data['Close'], 'blue')
         ax1.set_title('Close Price')
         ax1.set_ylabel('Price ($)')
         ax1.grid(True)
         
-        stock_data['Volatility'].plot(ax=ax2, color='red')
+        self._plot_series(ax2, stock_data['Volatility'], 'red')
         ax2.set_title(f'{vol_window}-Day Rolling Volatility')
         ax2.set_ylabel('Volatility')
         ax2.grid(True)
         
-        stock_data['RSI'].plot(ax=ax3, color='purple')
+        self._plot_series(ax3, stock_data['RSI'], 'purple')
         ax3.axhline(y=70, color='r', linestyle='--', alpha=0.5)
         ax3.axhline(y=30, color='g', linestyle='--', alpha=0.5)
         ax3.set_title(f'{rsi_period}-Day RSI')
@@ -130,62 +553,114 @@ class StockAnalyzer:
                 fontsize=12, color='black', ha='right', va='bottom',
                 bbox=dict(facecolor='white', edgecolor='black', alpha=0.8, pad=5))
         
-        plt.subplots_adjust(bottom=0.1, top=0.95)
+        fig.subplots_adjust(bottom=0.1, top=0.95)
         return fig
 
-    def save_analysis(self, stock_data, ticker, fig):
-        """Save the analysis results."""
-        ticker_dir = os.path.join(self.output_dir, ticker)
-        if not os.path.exists(ticker_dir):
-            os.makedirs(ticker_dir)
+    def save_analysis(self, stock_data, ticker, fig, prices=None):
+        """Save the analysis results.
+        
+        If the downloaded prices are given, their other columns (Open, High, ...) are written
+        to the data files alongside the calculated metrics.
+        """
+        ticker_dir = f'{self.output_dir}/{ticker}'
+        png_path = f'{ticker_dir}/{ticker}_analysis.png'
+        csv_path = f'{ticker_dir}/{ticker}_data.csv'
+        parquet_path = f'{ticker_dir}/{ticker}_data.parquet'
+        meta_path = f'{ticker_dir}/metadata.txt'
+        os.makedirs(ticker_dir, exist_ok=True)
         
-        fig.savefig(os.path.join(ticker_dir, f'{ticker}_analysis.png'), 
-                   dpi=300, bbox_inches='tight')
+        fig.savefig(png_path, dpi=self.dpi, bbox_inches='tight',
+                    pil_kwargs={'optimize': False, 'compress_level': 1})
         
-        csv_path = os.path.join(ticker_dir, f'{ticker}_data.csv')
-        stock_data.to_csv(csv_path)
+        output = stock_data
+        if prices is not None:
+            output = prices.loc[stock_data.index].copy()
+            for column in stock_data.columns:
+                output[column] = stock_data[column]
         
+        if HAVE_PYARROW:
+            # Keep the to_csv layout: unquoted header, dates formatted the way pandas prints them
+            table = output.reset_index()
+            table[table.columns[0]] = output.index.astype(str)
+            with open(csv_path, 'wb') as f:
+                f.write((','.join(str(column) for column in table.columns) + '\n').encode())
+                pacsv.write_csv(pa.Table.from_pandas(table, preserve_index=False), f,
+                                pacsv.WriteOptions(include_header=False, quoting_style='none'))
+            output.to_parquet(parquet_path, compression='snappy')
+        else:
+            output.to_csv(csv_path)
+        
+        first, last = stock_data.index[0], stock_data.index[-1]
         metadata = {
             'Author': self.author_name,
             'Analysis Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'Ticker': ticker,
-            'Data Range': f"{stock_data.index[0].strftime('%Y-%m-%d')} to {stock_data.index[-1].strftime('%Y-%m-%d')}"
+            'Data Range': f"{first:%Y-%m-%d} to {last:%Y-%m-%d}"
         }
         
-        with open(os.path.join(ticker_dir, 'metadata.txt'), 'w') as f:
-            for key, value in metadata.items():
-                f.write(f'{key}: {value}\n')
+        meta_body = ''.join(f'{key}: {value}\n' for key, value in metadata.items())
+        Path(meta_path).write_text(meta_body)
+
+    def _process_one(self, ticker, prices, vol_window, rsi_period, start_date):
+        """Calculate metrics, plot and save the analysis for a single stock."""
+        # Only Close feeds the metrics; the other price columns are reattached when saving
+        data = self.calculate_metrics(prices[['Close']].copy(), vol_window, rsi_period, start_date)
+        fig = self.plot_stock_analysis(data, ticker, vol_window, rsi_period)
+        self.save_analysis(data, ticker, fig, prices)
+        return data
+
+    def _run_jobs(self, jobs):
+        """Run _process_one for each job with the configured engine and return the results in order."""
+        if self.engine == 'dask':
+            if HAVE_DASK:
+                with Client() as client:
+                    futures = [client.submit(self._process_one, *job, pure=False) for job in jobs]
+                    return client.gather(futures)
+            print("dask is not installed, using a multiprocessing pool instead")
+            with multiprocessing.Pool(min(os.cpu_count() or 1, len(jobs))) as pool:
+                return pool.starmap(self._process_one, jobs)
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+            return list(executor.map(self._process_one, *zip(*jobs)))
 
-    def run_analysis(self):
+    def run_analysis(self, args=None):
         """Run the complete analysis."""
-        stocks, start_date, end_date, vol_window, rsi_period = self.get_user_input()
-        lookback_days = max(vol_window, rsi_period) * 2
+        stocks, start_date, end_date, vol_window, rsi_period = self.get_config(args)
         stock_data_dict = {}
+        # Metrics are not cached any more; clear out entries written by earlier versions
+        self._sweep_cache('_metrics_cache', METRICS_CACHE_MAX_AGE)
+        
+        batch = self.download_stock_data(stocks, start_date, end_date,
+                                         self.warmup_rows(vol_window, rsi_period))
+        if not batch:
+            return stock_data_dict
+        
+        jobs = [(ticker, data, vol_window, rsi_period, start_date)
+                for ticker, data in batch.items()]
+        results = dict(zip(batch, self._run_jobs(jobs)))
         
         for ticker in stocks:
+            if ticker not in results:
+                continue
             print(f"\nProcessing {ticker}...")
             
-            data = self.download_stock_data(ticker, start_date, end_date, lookback_days)
-            if data is not None:
-                data = self.calculate_metrics(data, vol_window, rsi_period, start_date)
-                stock_data_dict[ticker] = data
-                
-                print(f"Shape of data: {data.shape}")
-                print("\nLast 5 days of closing prices:")
-                print(data['Close'].tail())
-                print(f"\nCurrent Volatility: {data['Volatility'].iloc[-1]:.4f}")
-                print(f"Current RSI: {data['RSI'].iloc[-1]:.2f}")
-                
-                fig = self.plot_stock_analysis(data, ticker, vol_window, rsi_period)
-                self.save_analysis(data, ticker, fig)
-                plt.show()
+            data = results[ticker]
+            stock_data_dict[ticker] = data
+            
+            print(f"Shape of data: {data.shape}")
+            print("\nLast 5 days of closing prices:")
+            print(data['Close'].tail())
+            print(f"\nCurrent Volatility: {data['Volatility'].iloc[-1]:.4f}")
+            print(f"Current RSI: {data['RSI'].iloc[-1]:.2f}")
         
         return stock_data_dict
 
-def main():
-    author_name = input("Please enter your name: ").strip()
-    analyzer = StockAnalyzer(author_name)
-    stock_data = analyzer.run_analysis()
+def main(argv=None):
+    args = parse_cli(argv)
+    author_name = args.author or input("Please enter your name: ").strip()
+    analyzer = StockAnalyzer(author_name, hires=args.hires, fp32=args.fp32,
+                             engine=args.engine)
+    stock_data = analyzer.run_analysis(args)
     return stock_data
 
 if __name__ == "__main__":